@@ -0,0 +1,202 @@
+# agents/budget.py
+"""
+Token accounting for LLM calls.
+
+- counts tokens locally (tiktoken when available, ~4 chars/token otherwise)
+- sizes input truncation and max_tokens per node/category from observed output lengths
+- enforces per-cycle and per-day token ceilings
+- logs responses that finished with `length` (truncated output)
+"""
+import os
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+CYCLE_TOKEN_LIMIT = int(os.getenv("CYCLE_TOKEN_LIMIT", "20000"))    # prompt + completion per cycle
+DAILY_TOKEN_LIMIT = int(os.getenv("DAILY_TOKEN_LIMIT", "150000"))   # prompt + completion per UTC day
+BUDGET_FILE = os.getenv("TOKEN_BUDGET_FILE", ".cache/token_budget.json")
+HISTORY_SIZE = 50      # observed output lengths kept per node/category
+MIN_SAMPLES = 5        # below this we use the static defaults
+HEADROOM = 1.25        # margin on top of the p95 observed output
+
+# node -> (default max_tokens, floor, ceiling)
+OUTPUT_LIMITS = {
+    "curator": (60, 30, 150),
+    "classify": (10, 5, 20),
+    "writer": (2200, 1400, 3200),
+    "image_prompt": (150, 80, 250),
+    "editor": (2200, 1400, 4000),
+}
+
+# node -> max tokens of free-form input (summary etc.) sent to the model
+INPUT_LIMITS = {
+    "curator": 200,
+    "classify": 200,
+    "writer": 600,
+    "source": 1500,
+    "comments": 400,
+    "image_prompt": 150,
+}
+
+
+class BudgetExceeded(RuntimeError):
+    pass
+
+
+# ---------- token counting ----------
+_enc = None
+_enc_loaded = False
+
+def _encoding():
+    global _enc, _enc_loaded
+    if not _enc_loaded:
+        _enc_loaded = True
+        try:
+            import tiktoken
+            _enc = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            _enc = None
+    return _enc
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    enc = _encoding()
+    if enc is None:
+        return (len(text) + 3) // 4
+    return len(enc.encode(text, disallowed_special=()))
+
+def truncate_tokens(text: str, limit: int) -> str:
+    if not text or count_tokens(text) <= limit:
+        return text or ""
+    enc = _encoding()
+    if enc is None:
+        return text[: limit * 4].rstrip() + "…"
+    return enc.decode(enc.encode(text, disallowed_special=())[:limit]).rstrip() + "…"
+
+def input_cap(node: str) -> int:
+    return INPUT_LIMITS.get(node, 400)
+
+
+# ---------- persisted state ----------
+_lock = threading.Lock()
+_state: Optional[Dict[str, Any]] = None
+_cycle_used = 0
+
+def _today() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+def _load() -> Dict[str, Any]:
+    global _state
+    if _state is None:
+        try:
+            with open(BUDGET_FILE, "r", encoding="utf-8") as f:
+                _state = json.load(f)
+        except Exception:
+            _state = {}
+        _state.setdefault("history", {})
+        _state.setdefault("day", _today())
+        _state.setdefault("day_used", 0)
+    if _state["day"] != _today():
+        _state["day"] = _today()
+        _state["day_used"] = 0
+    return _state
+
+def _save():
+    try:
+        os.makedirs(os.path.dirname(BUDGET_FILE) or ".", exist_ok=True)
+        tmp = BUDGET_FILE + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(_state, f)
+        os.replace(tmp, BUDGET_FILE)
+    except Exception as ex:
+        print(f"[budget] save error: {ex}", flush=True)
+
+def start_cycle():
+    global _cycle_used
+    with _lock:
+        st = _load()
+        _cycle_used = 0
+        print(f"[budget] cycle start - day used={st['day_used']}/{DAILY_TOKEN_LIMIT}", flush=True)
+
+
+# ---------- sizing ----------
+def max_tokens_for(node: str, category: str = "", min_tokens: int = 0) -> int:
+    default, floor, ceiling = OUTPUT_LIMITS.get(node, (1000, 100, 4000))
+    with _lock:
+        hist = _load()["history"]
+        samples = hist.get(f"{node}:{category}") or []
+        if len(samples) < MIN_SAMPLES:
+            samples = hist.get(node) or []
+    if len(samples) >= MIN_SAMPLES:
+        s = sorted(samples)
+        p95 = s[min(len(s) - 1, int(len(s) * 0.95))]
+        limit = int(p95 * HEADROOM)
+    else:
+        limit = default
+    limit = max(limit, min_tokens, floor)
+    return min(limit, max(ceiling, min_tokens))
+
+def check(node: str, prompt_tokens: int, max_tokens: int):
+    """Raise BudgetExceeded if this call could push the cycle/day over its ceiling."""
+    need = prompt_tokens + max_tokens
+    with _lock:
+        st = _load()
+        if _cycle_used + need > CYCLE_TOKEN_LIMIT:
+            raise BudgetExceeded(f"{node}: cycle budget exhausted ({_cycle_used}+{need} > {CYCLE_TOKEN_LIMIT})")
+        if st["day_used"] + need > DAILY_TOKEN_LIMIT:
+            raise BudgetExceeded(f"{node}: daily budget exhausted ({st['day_used']}+{need} > {DAILY_TOKEN_LIMIT})")
+
+
+# ---------- accounting ----------
+def _usage(resp, prompt_tokens: int) -> Dict[str, int]:
+    um = getattr(resp, "usage_metadata", None) or {}
+    if um:
+        return {"input": int(um.get("input_tokens", 0)), "output": int(um.get("output_tokens", 0))}
+    tu = (getattr(resp, "response_metadata", None) or {}).get("token_usage") or {}
+    if tu:
+        return {"input": int(tu.get("prompt_tokens", 0)), "output": int(tu.get("completion_tokens", 0))}
+    return {"input": prompt_tokens, "output": count_tokens(getattr(resp, "content", "") or "")}
+
+def was_truncated(resp) -> bool:
+    meta = getattr(resp, "response_metadata", None) or {}
+    return meta.get("finish_reason") == "length"
+
+def record(node: str, category: str, resp, prompt_tokens: int = 0, max_tokens: int = 0):
+    global _cycle_used
+    usage = _usage(resp, prompt_tokens)
+    truncated = was_truncated(resp)
+    observed = usage["output"]
+    if truncated:
+        # real output would have been longer; grow the next estimate
+        observed = int(max(observed, max_tokens) * 1.5)
+        print(f"[budget] {node} ({category or '-'}) finished with length at {usage['output']}/{max_tokens} tokens", flush=True)
+    with _lock:
+        st = _load()
+        _cycle_used += usage["input"] + usage["output"]
+        st["day_used"] += usage["input"] + usage["output"]
+        for key in ([node, f"{node}:{category}"] if category else [node]):
+            h: List[int] = st["history"].setdefault(key, [])
+            h.append(observed)
+            del h[:-HISTORY_SIZE]
+        _save()
+    print(f"[budget] {node} in={usage['input']} out={usage['output']} max={max_tokens} "
+          f"cycle={_cycle_used}/{CYCLE_TOKEN_LIMIT}", flush=True)
+
+def _prompt_text(messages) -> str:
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(str(getattr(m, "content", m)) for m in messages)
+
+def invoke(llm, messages, node: str, category: str = "", min_tokens: int = 0):
+    """
+    Budgeted llm.invoke: sizes max_tokens for the node/category, checks the
+    cycle/day ceilings, then records usage. Raises BudgetExceeded when over.
+    """
+    max_tokens = max_tokens_for(node, category, min_tokens=min_tokens)
+    prompt_tokens = count_tokens(_prompt_text(messages))
+    check(node, prompt_tokens, max_tokens)
+    resp = llm.bind(max_tokens=max_tokens).invoke(messages)
+    record(node, category, resp, prompt_tokens=prompt_tokens, max_tokens=max_tokens)
+    return resp
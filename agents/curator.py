@@ -1,10 +1,19 @@
 # agents/curator.py
 import json
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage
 
+from agents import budget
+
 ALLOWED = {"AI", "Tech", "Science", "Futurology", "Marketing", "Interesting"}
-_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.2)
+_llm = None
+
+def _get_llm():
+    # created on first use so importing the module stays cheap; max_tokens sized per call by budget
+    global _llm
+    if _llm is None:
+        from langchain_openai import ChatOpenAI
+        _llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.2)
+    return _llm
 
 PROMPT = """You are a strict curator. Decide:
 1) category (one of: AI, Tech, Science, Futurology, Marketing, Interesting)
@@ -33,13 +42,17 @@ def _safe_json(text: str):
 def curator_node(state: dict) -> dict:
     post = state.get("original_post") or {}
     title = post.get("title", "").strip()
-    summary = post.get("summary", "").strip()
+    summary = budget.truncate_tokens(post.get("summary", "").strip(), budget.input_cap("curator"))
     url = post.get("url", "").strip()
 
     if not title:
         return {"status": "skip", "messages": [HumanMessage(content="No original_post; skipping curation")]}
 
-    resp = _llm.invoke(PROMPT.format(title=title, summary=summary, url=url))
+    try:
+        resp = budget.invoke(_get_llm(), PROMPT.format(title=title, summary=summary, url=url),
+                             "curator", post.get("category_hint") or "")
+    except budget.BudgetExceeded as e:
+        return {"status": "budget_exceeded", "worthy": False, "messages": [HumanMessage(content=f"Curator: {e}")]}
     data = _safe_json(resp.content)
 
     cat = (data.get("category") or post.get("category_hint") or "Interesting").strip().title()
@@ -50,11 +63,10 @@ def curator_node(state: dict) -> dict:
     if cat not in ALLOWED:
         cat = "Interesting"
 
-    # PASS-THROUGH original_post kako bi writer SIGURNO imao pristup
+    # original_post ostaje u state-u (ne kopiramo ga ponovo)
     return {
         "status": "curated" if worthy else "rejected",
         "category": cat,
         "worthy": worthy,
-        "original_post": post,
         "messages": [HumanMessage(content=f"Curated: {title[:60]}... -> {cat} / worthy={worthy}")]
     }
@@ -1,6 +1,8 @@
 # agents/editor.py
 from langchain_core.messages import HumanMessage
 
+from agents import budget
+
 PROMPT = """You are an editor. Improve the draft while keeping Markdown structure intact:
 - Fix grammar, spelling, and clarity
 - Keep headings, lists, links, and formatting
@@ -14,7 +16,8 @@ DRAFT:
 
 def _get_llm():
     from langchain_openai import ChatOpenAI
-    return ChatOpenAI(model="gpt-4o-mini", temperature=0.2, max_tokens=1200)
+    # max_tokens is sized per call from the draft length (see budget.invoke)
+    return ChatOpenAI(model="gpt-4o-mini", temperature=0.2)
 
 def editor_node(state: dict) -> dict:
     draft = state.get("draft_article", "")
@@ -25,11 +28,22 @@ def editor_node(state: dict) -> dict:
         }
     try:
         llm = _get_llm()
-        resp = llm.invoke(PROMPT.format(draft=draft))
+        # edited article is roughly as long as the draft; never allow less
+        min_tokens = int(budget.count_tokens(draft) * 1.15) + 50
+        resp = budget.invoke(llm, PROMPT.format(draft=draft), "editor", state.get("category") or "",
+                             min_tokens=min_tokens)
+        if budget.was_truncated(resp):
+            return {
+                "status": "final_ready",
+                "final_article": draft,
+                "draft_article": None,
+                "messages": [HumanMessage(content="Editor output truncated; publishing unedited draft")]
+            }
         final_article = resp.content.strip()
         return {
             "status": "final_ready",
             "final_article": final_article,
+            "draft_article": None,  # keep only one copy of the article in state
             "messages": [HumanMessage(content="Final ready")]
         }
     except Exception as e:
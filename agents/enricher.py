@@ -0,0 +1,226 @@
+# agents/enricher.py
+"""
+Enrichment between curator and writer: fetches the linked source page and the
+top Reddit comments concurrently (byte-capped, with timeouts), extracts the main
+text and caches it on disk by URL so repeated cycles don't pay the fetch again.
+Never fails the pipeline — on any error the writer just gets less context.
+"""
+import os
+import re
+import json
+import html
+import time
+import hashlib
+import requests
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
+from langchain_core.messages import HumanMessage
+
+# pip install trafilatura
+try:
+    import trafilatura
+except Exception:
+    trafilatura = None
+
+UA = os.getenv("REDDIT_USER_AGENT", "trendsqueeze-bot/1.0 (+https://trendsqueeze.com)")
+
+MAX_BYTES = int(os.getenv("ENRICH_MAX_BYTES", "1000000"))      # per response
+TIMEOUT = float(os.getenv("ENRICH_TIMEOUT", "10"))             # overall seconds for the whole node
+CACHE_DIR = os.getenv("ENRICH_CACHE_DIR", ".cache/enrich")
+CACHE_TTL = int(os.getenv("ENRICH_CACHE_TTL", "21600"))        # 6h
+MAX_TEXT_CHARS = 12000                                         # stored per source page
+TOP_COMMENTS = 5
+
+# hosts whose links are media, not articles
+_SKIP_HOSTS = ("reddit.com", "redd.it", "imgur.com", "youtube.com", "youtu.be", "v.redd.it", "i.redd.it")
+
+# ---------- disk cache ----------
+def _cache_path(kind: str, url: str) -> str:
+    key = hashlib.sha1(f"{kind}:{url}".encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+def _cache_get(kind: str, url: str):
+    path = _cache_path(kind, url)
+    try:
+        if time.time() - os.path.getmtime(path) > CACHE_TTL:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("value")
+    except Exception:
+        return None
+
+_last_prune = 0.0
+
+def _prune_cache():
+    """Delete expired cache files; runs at most once per TTL/4."""
+    global _last_prune
+    now = time.time()
+    if now - _last_prune < CACHE_TTL / 4:
+        return
+    _last_prune = now
+    try:
+        names = os.listdir(CACHE_DIR)
+    except OSError:
+        return
+    removed = 0
+    for name in names:
+        path = os.path.join(CACHE_DIR, name)
+        try:
+            if now - os.path.getmtime(path) > CACHE_TTL:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            continue
+    if removed:
+        print(f"[enricher] pruned {removed} expired cache entries", flush=True)
+
+def _cache_put(kind: str, url: str, value):
+    path = _cache_path(kind, url)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "value": value}, f)
+        os.replace(tmp, path)
+    except Exception as ex:
+        print(f"[enricher] cache write error: {ex}", flush=True)
+
+# ---------- fetching ----------
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.I)
+
+def _fetch(url: str, accept: str) -> Optional[Tuple[bytes, Optional[str]]]:
+    """
+    GET with a deadline and a hard byte cap. Returns (body, charset) or None on failure;
+    charset is None when the Content-Type header doesn't declare one.
+    """
+    deadline = time.monotonic() + TIMEOUT
+    headers = {"User-Agent": UA, "Accept": accept}
+    with requests.get(url, headers=headers, timeout=(min(5, TIMEOUT), TIMEOUT), stream=True) as r:
+        if r.status_code != 200:
+            return None
+        ctype = (r.headers.get("Content-Type") or "").lower()
+        if "html" not in ctype and "json" not in ctype and "text" not in ctype:
+            return None
+        buf = bytearray()
+        for chunk in r.iter_content(chunk_size=16384):
+            buf += chunk
+            if len(buf) >= MAX_BYTES or time.monotonic() > deadline:
+                break
+        # requests defaults text/* to ISO-8859-1 when the header has no charset; don't trust that
+        charset = r.encoding if "charset=" in ctype else None
+        return bytes(buf[:MAX_BYTES]), charset
+
+def _decode(body: bytes, charset: Optional[str]) -> str:
+    if not charset:
+        m = _META_CHARSET_RE.search(body[:4096])
+        charset = m.group(1).decode("ascii", "ignore") if m else "utf-8"
+    try:
+        return body.decode(charset, errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+# ---------- extraction ----------
+_DROP_RE = re.compile(r"<(script|style|noscript|nav|header|footer|aside|form)\b.*?</\1\s*>", re.I | re.S)
+_P_RE = re.compile(r"<p\b[^>]*>(.*?)</p\s*>", re.I | re.S)
+
+def _extract_text(raw: bytes, charset: Optional[str]) -> str:
+    if trafilatura is not None:
+        try:
+            # bytes in: trafilatura detects the encoding itself (incl. <meta charset>)
+            text = trafilatura.extract(raw, include_comments=False, include_tables=False, favor_precision=True)
+            if text:
+                return text.strip()[:MAX_TEXT_CHARS]
+        except Exception:
+            pass
+    # fallback: paragraphs outside of page chrome
+    body = _DROP_RE.sub("", _decode(raw, charset))
+    paras = []
+    for p in _P_RE.findall(body):
+        t = html.unescape(re.sub(r"<.*?>", "", p))
+        t = " ".join(t.split())
+        if len(t) >= 60:
+            paras.append(t)
+    return "\n\n".join(paras)[:MAX_TEXT_CHARS]
+
+def _is_article_url(url: str) -> bool:
+    host = (urlparse(url).hostname or "").lower()
+    if not host:
+        return False
+    return not any(host == h or host.endswith("." + h) for h in _SKIP_HOSTS)
+
+def _source_text(url: str) -> str:
+    cached = _cache_get("page", url)
+    if cached is not None:
+        return cached
+    page = _fetch(url, "text/html,application/xhtml+xml")
+    if page is None:
+        return ""  # failed fetch (403/429/5xx/timeout): not cached, retried next cycle
+    text = _extract_text(*page)
+    _cache_put("page", url, text)
+    return text
+
+def _comments_url(post_url: str) -> Optional[str]:
+    if "/comments/" not in post_url:
+        return None
+    return post_url.split("?", 1)[0].rstrip("/") + "/.json?sort=top&depth=1&limit=25"
+
+def _reddit_comments(post_url: str) -> List[str]:
+    url = _comments_url(post_url)
+    if not url:
+        return []
+    cached = _cache_get("comments", url)
+    if cached is not None:
+        return cached
+    raw = _fetch(url, "application/json")
+    if raw is None:
+        return []  # failed fetch: not cached
+    data = json.loads(raw[0].decode("utf-8", errors="replace"))
+    children = data[1]["data"]["children"] if isinstance(data, list) and len(data) > 1 else []
+    rows = [c.get("data", {}) for c in children if c.get("kind") == "t1"]
+    rows = [c for c in rows if c.get("body") and c.get("body") not in ("[deleted]", "[removed]")]
+    rows.sort(key=lambda c: c.get("score") or 0, reverse=True)
+    comments = [" ".join(c["body"].split())[:400] for c in rows[:TOP_COMMENTS]]
+    _cache_put("comments", url, comments)
+    return comments
+
+# ---------- NODE ----------
+def enricher_node(state: dict) -> dict:
+    post = state.get("original_post") or {}
+    post_url = (post.get("url") or "").strip()
+    source_url = (post.get("source_url") or "").strip()
+
+    _prune_cache()
+
+    # node-level deadline: a slow fetch is abandoned, not waited for
+    deadline = time.monotonic() + TIMEOUT
+    jobs = {}
+    pool = ThreadPoolExecutor(max_workers=2)
+    if source_url and _is_article_url(source_url):
+        jobs["source"] = pool.submit(_source_text, source_url)
+    if post_url:
+        jobs["comments"] = pool.submit(_reddit_comments, post_url)
+
+    source_text, comments = "", []
+    try:
+        for name, fut in jobs.items():
+            try:
+                result = fut.result(timeout=max(0.0, deadline - time.monotonic()))
+                if name == "source":
+                    source_text = result or ""
+                else:
+                    comments = result or []
+            except FutureTimeout:
+                print(f"[enricher] {name} fetch timed out after {TIMEOUT:.0f}s", flush=True)
+            except Exception as ex:
+                print(f"[enricher] {name} fetch error: {ex}", flush=True)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    print(f"[enricher] source chars={len(source_text)} comments={len(comments)}", flush=True)
+    return {
+        "status": "enriched",
+        "source_text": source_text,
+        "reddit_comments": comments,
+        "messages": [HumanMessage(content=f"Enriched: source={len(source_text)} chars, comments={len(comments)}")]
+    }
@@ -0,0 +1,73 @@
+# agents/importprof.py
+"""
+Startup timing (--timing): records the inclusive wall time of every first-time
+import made after install() and prints the direct ones (ours + 1 level down).
+Imports done via importlib.import_module bypass builtins.__import__ and are
+only counted inside whichever import triggered them.
+"""
+import sys
+import time
+import builtins
+
+class ImportTimer:
+    __slots__ = ("rows", "depth", "started", "_orig")
+
+    def __init__(self):
+        self.rows = []            # (depth, name, seconds), in completion order
+        self.depth = 0
+        self.started = time.perf_counter()
+        self._orig = builtins.__import__
+
+    @staticmethod
+    def _pending(name, fromlist):
+        """Label of what this import will load, or None if everything is already loaded."""
+        mod = sys.modules.get(name)
+        if mod is None:
+            return name
+        if fromlist and hasattr(mod, "__path__"):
+            # `from pkg import sub` loads pkg.sub without going through __import__ again
+            missing = [f for f in fromlist if f != "*" and not hasattr(mod, f)]
+            if missing:
+                return f"{name}.{missing[0]}" if len(missing) == 1 else f"{name}.{{{','.join(missing)}}}"
+        return None
+
+    def __call__(self, name, globals=None, locals=None, fromlist=(), level=0):
+        label = None if level else self._pending(name, fromlist)
+        if label is None:
+            return self._orig(name, globals, locals, fromlist, level)
+        depth = self.depth
+        self.depth += 1
+        t0 = time.perf_counter()
+        try:
+            return self._orig(name, globals, locals, fromlist, level)
+        finally:
+            self.depth = depth
+            self.rows.append((depth, label, time.perf_counter() - t0))
+
+    def install(self):
+        builtins.__import__ = self
+        return self
+
+    def uninstall(self):
+        builtins.__import__ = self._orig
+
+    def report(self, max_depth: int = 1):
+        self.uninstall()
+        total = time.perf_counter() - self.started
+        # rows complete child-first; print parents before their children
+        out, stack = [], []
+        for depth, name, secs in self.rows:
+            children = []
+            while stack and stack[-1][0] > depth:
+                children.insert(0, stack.pop())
+            stack.append((depth, name, secs, children))
+        def walk(node):
+            depth, name, secs, children = node
+            if depth <= max_depth:
+                out.append(f"[timing] {'  ' * depth}{name:<{40 - 2 * depth}} {secs * 1000:8.1f} ms")
+                for c in children:
+                    walk(c)
+        for node in stack:
+            walk(node)
+        print("\n".join(out), flush=True)
+        print(f"[timing] total since start {total * 1000:.1f} ms", flush=True)
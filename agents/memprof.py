@@ -0,0 +1,75 @@
+# agents/memprof.py
+"""
+Memory profiling mode (MEMPROFILE=1): logs per-node state/update size and
+process RSS growth per node and across cycles. Cheap enough for Render starter.
+"""
+import os
+import sys
+import functools
+from collections import deque
+from dataclasses import fields, is_dataclass
+
+ENABLED = os.getenv("MEMPROFILE", "").strip().lower() in {"1", "true", "yes"}
+
+def deep_size(obj, _seen=None) -> int:
+    """Approximate retained size in bytes of a state value (dicts, lists, dataclasses, strings)."""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(deep_size(x, seen) for x in obj)
+    elif is_dataclass(obj) and not isinstance(obj, type):
+        size += sum(deep_size(getattr(obj, f.name), seen) for f in fields(obj))
+    elif hasattr(obj, "__dict__"):
+        size += deep_size(vars(obj), seen)
+    return size
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024   # peak, Linux KB
+
+def _kb(n: int) -> str:
+    return f"{n / 1024:.1f}KB"
+
+def _mb(n: int) -> str:
+    return f"{n / (1024 * 1024):.1f}MB"
+
+def profiled(name: str, fn):
+    """Wrap a graph node; no-op unless MEMPROFILE is on."""
+    if not ENABLED:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(state):
+        rss0 = rss_bytes()
+        out = fn(state)
+        rss1 = rss_bytes()
+        print(f"[mem] {name} state={_kb(deep_size(state))} update={_kb(deep_size(out))} "
+              f"rss={_mb(rss1)} ({(rss1 - rss0) / 1024:+.0f}KB)", flush=True)
+        return out
+    return wrapper
+
+class CycleTracker:
+    __slots__ = ("baseline", "last", "cycles")
+
+    def __init__(self):
+        self.baseline = rss_bytes()
+        self.last = self.baseline
+        self.cycles = 0
+
+    def report(self, final_state):
+        if not ENABLED:
+            return
+        now = rss_bytes()
+        self.cycles += 1
+        print(f"[mem] cycle #{self.cycles} final_state={_kb(deep_size(final_state))} rss={_mb(now)} "
+              f"cycle={(now - self.last) / 1024:+.0f}KB total={(now - self.baseline) / 1024:+.0f}KB", flush=True)
+        self.last = now
@@ -8,11 +8,18 @@ from typing import List, Tuple, Optional
 from langchain_core.messages import HumanMessage
 
 # ---------- OpenAI (SDK v1.x) ----------
-try:
-    import openai
-    client = openai.OpenAI()
-except Exception:
-    client = None
+# created on first image request, not at import time
+_client = None
+
+def _get_client():
+    global _client
+    if _client is None:
+        try:
+            import openai
+            _client = openai.OpenAI()
+        except Exception:
+            return None
+    return _client
 
 # ---------- Markdown -> HTML ----------
 # pip install markdown
@@ -25,14 +32,13 @@ UA = os.getenv("WP_USER_AGENT", "trendsqueeze-agent/1.0 (+https://trendsqueeze.c
 
 # Slugovi iz tvog sajta (prema /wp-json/wp/v2/categories):
 CATEGORY_SLUG_MAP = {
-    "Marketing": "marketing" (id=31)
-    "Tech": "tech" (id=33)
-    "Science": "science" (id=32)
-    "Futurology": "futurology" (id=36)
-    "AI": "ai" (id=37)
-    "Interesting": "interesting" (id=35)
-    "Trends": "trends" (id=26)
-
+    "Marketing": "marketing",      # id=31
+    "Tech": "tech",                # id=33
+    "Science": "science",          # id=32
+    "Futurology": "futurology",    # id=36
+    "AI": "ai",                    # id=37
+    "Interesting": "interesting",  # id=35
+    "Trends": "trends",            # id=26
 }
 
 def _wp_default_cat_id() -> Optional[int]:
@@ -78,6 +84,7 @@ def _gen_image_b64(prompt: str, size: str) -> str:
     size: 1024x1024, 1024x1536, 1536x1024, or 'auto'
     Returns base64 (no data: prefix).
     """
+    client = _get_client()
     if client is None:
         raise RuntimeError("OpenAI client not available for image generation")
     resp = client.images.generate(
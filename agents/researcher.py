@@ -36,32 +36,53 @@ def _clean_html(text: str) -> str:
     text = re.sub(r"<.*?>", "", text)
     return re.sub(r"\n{3,}", "\n\n", text).strip()
 
+_LINK_RE = re.compile(r'<a\s+href="([^"]+)"[^>]*>\s*\[link\]\s*</a>', re.I)
+
+def _source_link(raw_html: str) -> str:
+    # Reddit RSS summary sadrži "[link]" anchor ka originalnom izvoru
+    m = _LINK_RE.search(raw_html or "")
+    return m.group(1).replace("&amp;", "&").strip() if m else ""
+
+def fetch_feed(category: str) -> list:
+    """Top/day stavke jednog feed-a; `rank` je pozicija u top listi (0 = najbolji)."""
+    feed = feedparser.parse(_rss_url(FEEDS[category]), request_headers={"User-Agent": UA})
+    # feedparser ne baca izuzetak na mrežne/429/5xx greške: vraća bozo=1 i prazne entries
+    status = feed.get("status") or 200
+    if status >= 400 or not feed.entries:
+        reason = feed.get("bozo_exception") or "no entries"
+        raise RuntimeError(f"feed fetch failed (status={status}): {reason}")
+    items = []
+    for e in feed.entries:
+        title = (getattr(e, "title", "") or "").strip()
+        link = (getattr(e, "link", "") or "").strip()
+        raw = getattr(e, "summary", "") or getattr(e, "description", "")
+        summary = _clean_html(raw)
+        if not title or not link:
+            continue
+        # Reddit često vraća "https://www.reddit.com/r/.../comments/.../..." linkove
+        items.append({
+            "title": title[:280],
+            "url": link,
+            "summary": summary[:700],
+            "source_url": _source_link(raw),
+            "category_hint": category,
+            "rank": len(items),
+        })
+    return items
+
 def _collect_candidates():
     items = []
-    for category, sub in FEEDS.items():
-        url = _rss_url(sub)
+    for category in FEEDS:
         try:
-            feed = feedparser.parse(url, request_headers={"User-Agent": UA})
-            for e in feed.entries:
-                title = (getattr(e, "title", "") or "").strip()
-                link = (getattr(e, "link", "") or "").strip()
-                summary = _clean_html(getattr(e, "summary", "") or getattr(e, "description", ""))
-                if not title or not link:
-                    continue
-                # Reddit često vraća "https://www.reddit.com/r/.../comments/.../..." linkove
-                items.append({
-                    "title": title[:280],
-                    "url": link,
-                    "summary": summary[:700],
-                    "category_hint": category
-                })
+            items.extend(fetch_feed(category))
         except Exception as ex:
             print(f"[researcher] rss error {category}: {ex}", flush=True)
             continue
     return items
 
 def researcher_node(state: dict) -> dict:
-    pool = _collect_candidates()
+    # scheduler već može da prosledi nove kandidate (sortirane po rank-u)
+    pool = state.get("candidates") or _collect_candidates()
     print(f"[researcher] pool size={len(pool)}", flush=True)
 
     if not pool:
@@ -85,7 +106,9 @@ def researcher_node(state: dict) -> dict:
             "title": candidate["title"],
             "summary": candidate["summary"],
             "url": candidate["url"],
+            "source_url": candidate["source_url"],
             "category_hint": candidate["category_hint"],
         },
+        "candidates": None,
         "messages": [HumanMessage(content=f"Picked: {candidate['title'][:80]}")]
     }
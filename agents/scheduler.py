@@ -0,0 +1,116 @@
+# agents/scheduler.py
+"""
+Adaptive per-feed polling.
+
+Each feed tracks its new-item arrival rate (EWMA, items/hour, persisted to disk)
+and is polled roughly when TARGET_NEW fresh items are expected, jittered and
+clamped to [MIN_POLL, MAX_POLL]. A failed fetch leaves the rate alone and
+retries after MIN_POLL. New items ranked within TOP_RANK of a feed's
+top/day list become pipeline candidates.
+"""
+import os
+import json
+import time
+import random
+from typing import Any, Dict, List
+
+from agents.researcher import FEEDS, fetch_feed
+
+STATE_FILE = os.getenv("SCHEDULER_STATE_FILE", ".cache/feed_schedule.json")
+MIN_POLL = int(os.getenv("FEED_MIN_POLL_SECS", "900"))        # 15 min
+MAX_POLL = int(os.getenv("FEED_MAX_POLL_SECS", "21600"))      # 6h
+FIRST_POLL = 3600                                             # until a feed has a measured rate
+TARGET_NEW = float(os.getenv("FEED_TARGET_NEW", "3"))         # new items expected per poll
+TOP_RANK = int(os.getenv("FEED_TOP_RANK", "5"))               # "high-scoring" = within top N of top/day
+JITTER = 0.15
+ALPHA = 0.3                                                   # EWMA weight of the latest observation
+SEEN_PER_FEED = 200
+MAX_PENDING = 50
+
+
+class FeedScheduler:
+    def __init__(self, path: str = STATE_FILE):
+        self.path = path
+        self.feeds: Dict[str, Dict[str, Any]] = self._load()
+        self.pending: List[Dict[str, Any]] = []
+        for category in FEEDS:
+            self.feeds.setdefault(category, {"seen": [], "rate": None, "last_poll": 0.0, "next_poll": 0.0})
+
+    # ---------- persistence ----------
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {k: v for k, v in data.items() if k in FEEDS}
+        except Exception:
+            return {}
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.feeds, f)
+            os.replace(tmp, self.path)
+        except Exception as ex:
+            print(f"[scheduler] save error: {ex}", flush=True)
+
+    # ---------- scheduling ----------
+    def _interval(self, rate) -> float:
+        if rate is None:
+            secs = FIRST_POLL
+        elif rate <= 0:
+            secs = MAX_POLL
+        else:
+            secs = TARGET_NEW / rate * 3600
+        secs *= random.uniform(1 - JITTER, 1 + JITTER)
+        return min(max(secs, MIN_POLL), MAX_POLL)
+
+    def next_due(self) -> float:
+        return min(f["next_poll"] for f in self.feeds.values())
+
+    def seconds_until_due(self) -> int:
+        return max(0, int(self.next_due() - time.time()))
+
+    def _poll(self, category: str, now: float) -> List[Dict[str, Any]]:
+        feed = self.feeds[category]
+        items = fetch_feed(category)
+        seen = set(feed["seen"])
+        new = [it for it in items if it["url"] not in seen]
+        bootstrap = not feed["seen"]
+
+        if not bootstrap and feed["last_poll"]:
+            hours = max((now - feed["last_poll"]) / 3600, 1e-3)
+            observed = len(new) / hours
+            feed["rate"] = observed if feed["rate"] is None else ALPHA * observed + (1 - ALPHA) * feed["rate"]
+
+        feed["seen"] = (feed["seen"] + [it["url"] for it in new])[-SEEN_PER_FEED:]
+        feed["last_poll"] = now
+        feed["next_poll"] = now + self._interval(feed["rate"])
+
+        hot = [it for it in new if it["rank"] < TOP_RANK]
+        rate = f"{feed['rate']:.2f}/h" if feed["rate"] is not None else "n/a"
+        print(f"[scheduler] {category}: items={len(items)} new={len(new)} hot={len(hot)} "
+              f"rate={rate} next in {int(feed['next_poll'] - now)}s", flush=True)
+        return hot
+
+    def poll_due(self) -> List[Dict[str, Any]]:
+        """Poll every feed that is due; returns (and keeps pending) new high-ranked candidates."""
+        now = time.time()
+        for category, feed in self.feeds.items():
+            if feed["next_poll"] > now:
+                continue
+            try:
+                self.pending.extend(self._poll(category, now))
+            except Exception as ex:
+                # retry sooner than the normal interval, but don't hammer a failing feed
+                feed["next_poll"] = now + MIN_POLL
+                print(f"[scheduler] rss error {category}: {ex}", flush=True)
+        self._save()
+        self.pending.sort(key=lambda it: it["rank"])
+        del self.pending[MAX_PENDING:]
+        return list(self.pending)
+
+    def take_pending(self) -> List[Dict[str, Any]]:
+        out, self.pending = self.pending, []
+        return out
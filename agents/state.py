@@ -0,0 +1,89 @@
+# agents/state.py
+"""
+Typed pipeline state for the LangGraph app.
+
+- slotted dataclass: fixed set of keys, no per-instance __dict__
+- `messages` is a bounded ring buffer of plain strings (not HumanMessage objects)
+- large texts (source_text, draft_article) are dropped by the node that consumes
+  them, so only one copy of the article is alive at a time
+- `.get()` keeps the dict-style access every node already uses
+"""
+import os
+from collections import deque
+from dataclasses import dataclass, field, fields
+from typing import Annotated, Any, Dict, List, Optional
+
+MAX_MESSAGES = int(os.getenv("STATE_MAX_MESSAGES", "50"))
+
+def _as_text(m) -> str:
+    return str(getattr(m, "content", m))
+
+def bounded_log(left: Optional[deque], right) -> deque:
+    """Reducer: append node messages, keep only the last MAX_MESSAGES."""
+    log = deque(left or (), maxlen=MAX_MESSAGES)
+    if right is None:
+        return log
+    if isinstance(right, (str, bytes)) or not hasattr(right, "__iter__"):
+        right = [right]
+    log.extend(_as_text(m) for m in right)
+    return log
+
+
+@dataclass(slots=True)
+class PipelineState:
+    # control
+    status: Optional[str] = None
+    worthy: Optional[bool] = None
+    category: Optional[str] = None
+
+    # scheduler -> fresh high-ranked feed items for the researcher to pick from
+    candidates: Optional[List[Dict[str, Any]]] = None
+
+    # researcher -> {title, summary, url, source_url, category_hint}; written once
+    original_post: Optional[Dict[str, str]] = None
+
+    # enricher (consumed and cleared by writer)
+    source_text: Optional[str] = None
+    reddit_comments: Optional[List[str]] = None
+
+    # writer / editor (draft cleared by editor once final exists)
+    draft_article: Optional[str] = None
+    image_prompt: Optional[str] = None
+    final_article: Optional[str] = None
+
+    # publisher
+    post_id: Optional[int] = None
+    post_link: Optional[str] = None
+    featured_media_id: Optional[int] = None
+
+    messages: Annotated[deque, bounded_log] = field(default_factory=lambda: deque(maxlen=MAX_MESSAGES))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        v = getattr(self, key, None)
+        return default if v is None else v
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PipelineState":
+        """Build from a saved/returned state dict; unknown keys raise ValueError."""
+        data = dict(data or {})
+        unknown = sorted(set(data) - {f.name for f in fields(cls)})
+        if unknown:
+            raise ValueError(f"unknown state key(s): {', '.join(unknown)}")
+        msgs = data.pop("messages", None)
+        st = cls(**data)
+        st.messages = bounded_log(None, msgs)
+        return st
+
+    def apply(self, update: Dict[str, Any]) -> "PipelineState":
+        """Merge a node's update the same way the graph channels do."""
+        for k, v in (update or {}).items():
+            if k == "messages":
+                self.messages = bounded_log(self.messages, v)
+            else:
+                setattr(self, k, v)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {f.name: getattr(self, f.name) for f in fields(self)}
+        d["messages"] = list(self.messages)
+        return d
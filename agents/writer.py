@@ -1,7 +1,8 @@
 # agents/writer.py
 from typing import Dict, Any, List
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
+
+from agents import budget
 
 ALLOWED_CATEGORIES: List[str] = [
     "Marketing",
@@ -14,8 +15,9 @@ ALLOWED_CATEGORIES: List[str] = [
 ]
 
 def _get_llm():
-    # Stable & fast enough for server
-    return ChatOpenAI(model="gpt-4o-mini", temperature=0.4, max_tokens=1800)
+    # Stable & fast enough for server; max_tokens is sized per call by budget
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model="gpt-4o-mini", temperature=0.4)
 
 # ---------- SYSTEM PROMPTS ----------
 WRITER_SYSTEM = """You are a senior tech journalist. Write clear, engaging, SEO-friendly English articles.
@@ -40,11 +42,18 @@ Context:
 - Summary: {summary}
 - Source URL: {url}
 
+Source excerpt:
+{source}
+
+Top reader comments:
+{comments}
+
 Requirements:
 - Target length: 700–1000 words.
 - Start with a single H1 that’s clear and specific (rewrite if needed).
 - Use 3–5 H2 sections.
 - Include concrete examples where useful.
+- Base facts on the source excerpt; don't invent numbers or quotes. Comments are opinions, not facts.
 - Add “Why it matters”, then “Caveats & Limitations” (if relevant), then “Key takeaways”.
 - Do NOT add any images or prompts in the text.
 
@@ -105,6 +114,8 @@ def writer_node(state: Dict[str, Any]) -> Dict[str, Any]:
       - curated_post: {title, summary, url, category_hint?}
     or
       - original_post: {title, summary, url, category_hint?}
+    Optional (from enricher):
+      - source_text: str, reddit_comments: [str,...]
 
     Returns:
       - status: "draft_ready" | "skip" | "error"
@@ -118,6 +129,8 @@ def writer_node(state: Dict[str, Any]) -> Dict[str, Any]:
     summary = (post.get("summary") or "").strip()
     url = (post.get("url") or post.get("link") or "").strip()
     upstream_hint = (post.get("category_hint") or state.get("category") or "").strip()
+    source_text = (state.get("source_text") or "").strip()
+    comments = state.get("reddit_comments") or []
 
     if not (title or summary or url):
         return {
@@ -129,31 +142,54 @@ def writer_node(state: Dict[str, Any]) -> Dict[str, Any]:
 
     # 1) Classify category (force to allowed set)
     try:
-        cls_resp = llm.invoke([
+        cls_resp = budget.invoke(llm, [
             SystemMessage(content=CLASSIFY_SYSTEM),
             HumanMessage(content=CLASSIFY_USER_TMPL.format(
                 allowed=", ".join(ALLOWED_CATEGORIES),
                 title=title,
-                summary=summary,
+                summary=budget.truncate_tokens(summary, budget.input_cap("classify")),
                 url=url
             ))
-        ])
+        ], "classify")
         category = _normalize_category(cls_resp.content.strip())
+    except budget.BudgetExceeded as e:
+        return {
+            "status": "budget_exceeded",
+            "messages": [HumanMessage(content=f"Writer: {e}")]
+        }
     except Exception:
         category = _normalize_category(upstream_hint or "Tech")
 
     # 2) Write the article (Markdown)
     try:
-        md_resp = llm.invoke([
+        md_resp = budget.invoke(llm, [
             SystemMessage(content=WRITER_SYSTEM),
-            HumanMessage(content=WRITER_USER_TMPL.format(title=title, summary=summary, url=url))
-        ])
+            HumanMessage(content=WRITER_USER_TMPL.format(
+                title=title,
+                summary=budget.truncate_tokens(summary, budget.input_cap("writer")),
+                url=url,
+                source=budget.truncate_tokens(source_text, budget.input_cap("source")) or "(not available)",
+                comments=budget.truncate_tokens(
+                    "\n".join(f"- {c}" for c in comments), budget.input_cap("comments")
+                ) or "(none)",
+            ))
+        ], "writer", category)
+        if budget.was_truncated(md_resp):
+            return {
+                "status": "error",
+                "messages": [HumanMessage(content="Writer: draft hit max_tokens (truncated)")]
+            }
         draft_article = (md_resp.content or "").strip()
         if not draft_article or len(draft_article) < 300 or "\n#" not in draft_article:
             return {
                 "status": "error",
                 "messages": [HumanMessage(content="Writer: draft too short or malformed")]
             }
+    except budget.BudgetExceeded as e:
+        return {
+            "status": "budget_exceeded",
+            "messages": [HumanMessage(content=f"Writer: {e}")]
+        }
     except Exception as e:
         return {
             "status": "error",
@@ -162,14 +198,14 @@ def writer_node(state: Dict[str, Any]) -> Dict[str, Any]:
 
     # 3) Generate a high-quality BASE image prompt (single line)
     try:
-        img_resp = llm.invoke([
+        img_resp = budget.invoke(llm, [
             SystemMessage(content=IMAGE_SYSTEM),
             HumanMessage(content=IMAGE_USER_TMPL.format(
                 title=title,
-                summary=summary,
+                summary=budget.truncate_tokens(summary, budget.input_cap("image_prompt")),
                 category=category
             ))
-        ])
+        ], "image_prompt", category)
         image_prompt = " ".join((img_resp.content or "").strip().split())
         if not image_prompt or len(image_prompt) < 20:
             image_prompt = (
@@ -189,5 +225,8 @@ def writer_node(state: Dict[str, Any]) -> Dict[str, Any]:
         "draft_article": draft_article,
         "image_prompt": image_prompt,
         "category": category,
+        # enrichment is consumed; don't carry it through the rest of the graph
+        "source_text": None,
+        "reddit_comments": None,
         "messages": [HumanMessage(content=f"Writer produced draft, category={category}, image prompt ready")],
     }
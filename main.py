@@ -1,20 +1,30 @@
 # main.py
+import sys
+
+# --timing: install the import timer before anything else is imported
+_TIMER = None
+if __name__ == "__main__" and "--timing" in sys.argv[1:]:
+    from agents.importprof import ImportTimer
+    _TIMER = ImportTimer().install()
+
 import os
+import json
 import time
 import signal
+import argparse
 import traceback
+import contextlib
 from datetime import datetime, timezone
-from langgraph.graph import StateGraph, END
 
-# agents
-from agents.researcher import researcher_node
-from agents.curator import curator_node
-from agents.writer import writer_node
-from agents.editor import editor_node
-from agents.publisher import publisher_node
+# lightweight (stdlib-only) helpers; langgraph, LLM clients and agents load lazily
+from agents import budget
+from agents.state import PipelineState
+from agents.memprof import profiled, CycleTracker
 
 # ---------- config ----------
-SLEEP_SECS = int(os.getenv("WORKER_SLEEP_SECS", "7200"))   # pause between cycles (default 2h)
+SCHEDULE = os.getenv("WORKER_SCHEDULE", "adaptive").strip().lower()  # adaptive | fixed
+SLEEP_SECS = int(os.getenv("WORKER_SLEEP_SECS", "7200"))   # fixed: pause between cycles (default 2h)
+MIN_CYCLE_GAP = int(os.getenv("MIN_CYCLE_GAP_SECS", "1800"))  # adaptive: min gap between pipeline runs
 HEARTBEAT_EVERY = int(os.getenv("HEARTBEAT_EVERY", "60"))  # heartbeat period in seconds
 MAX_BACKOFF = int(os.getenv("MAX_BACKOFF", "300"))         # max retry backoff (5 min)
 
@@ -31,15 +41,49 @@ def _handle_signal(signum, _frame):
 for _sig in (signal.SIGTERM, signal.SIGINT):
     signal.signal(_sig, _handle_signal)
 
+# ---------- agents (lazy) ----------
+NODES = {
+    "researcher": ("agents.researcher", "researcher_node"),
+    "curator": ("agents.curator", "curator_node"),
+    "enricher": ("agents.enricher", "enricher_node"),
+    "writer": ("agents.writer", "writer_node"),
+    "editor": ("agents.editor", "editor_node"),
+    "publisher": ("agents.publisher", "publisher_node"),
+}
+
+def load_node(name: str):
+    module, fn = NODES[name]
+    return getattr(__import__(module, fromlist=[fn]), fn)
+
+def lazy_node(name: str):
+    """Graph node that imports its agent module on first call, so unused stages cost nothing."""
+    fn = None
+
+    def run(state):
+        nonlocal fn
+        if fn is None:
+            fn = load_node(name)
+        return fn(state)
+    run.__name__ = name
+    return run
+
+def dry_run_publisher(state) -> dict:
+    article = state.get("final_article") or ""
+    title = article.split("\n", 1)[0].lstrip("# ").strip()
+    print(f"[dry-run] would publish: {title[:80]!r} ({len(article)} chars, category={state.get('category')})", flush=True)
+    return {"status": "dry_run", "messages": [f"Dry run: skipped publishing '{title[:60]}'"]}
+
 # ---------- graph ----------
-def build_app():
+def build_app(dry_run: bool = False):
+    from langgraph.graph import StateGraph, END
+
     def route_from_researcher(state: dict):
         # proceed only when researcher found a post
         return "curator" if state.get("status") == "research_done" else END
 
     def route_from_curator(state: dict):
-        # write only if curator thinks it's worthy
-        return "writer" if state.get("worthy") else END
+        # enrich + write only if curator thinks it's worthy
+        return "enricher" if state.get("worthy") else END
 
     def route_from_writer(state: dict):
         # edit only if draft is ready
@@ -49,18 +93,17 @@ def build_app():
         # publish only if final article is ready
         return "publisher" if state.get("status") == "final_ready" else END
 
-    graph = StateGraph(dict)
+    graph = StateGraph(PipelineState)
 
-    graph.add_node("researcher", researcher_node)
-    graph.add_node("curator", curator_node)
-    graph.add_node("writer", writer_node)
-    graph.add_node("editor", editor_node)
-    graph.add_node("publisher", publisher_node)
+    for name in NODES:
+        fn = dry_run_publisher if (dry_run and name == "publisher") else lazy_node(name)
+        graph.add_node(name, profiled(name, fn))
 
     graph.set_entry_point("researcher")
 
     graph.add_conditional_edges("researcher", route_from_researcher, {"curator": "curator", END: END})
-    graph.add_conditional_edges("curator", route_from_curator, {"writer": "writer", END: END})
+    graph.add_conditional_edges("curator", route_from_curator, {"enricher": "enricher", END: END})
+    graph.add_edge("enricher", "writer")
     graph.add_conditional_edges("writer", route_from_writer, {"editor": "editor", END: END})
     graph.add_conditional_edges("editor", route_from_editor, {"publisher": "publisher", END: END})
     graph.add_edge("publisher", END)
@@ -68,10 +111,11 @@ def build_app():
     return graph.compile()
 
 # ---------- one cycle ----------
-def one_cycle(app):
+def one_cycle(app, mem=None, initial=None):
     print(f"[worker] {_now()} cycle start", flush=True)
+    budget.start_cycle()
     try:
-        final_state = app.invoke({})
+        final_state = app.invoke(initial or {})
 
         # optional: print any messages accumulated by nodes
         msgs = final_state.get("messages") or []
@@ -83,29 +127,68 @@ def one_cycle(app):
         post_id = final_state.get("post_id")
         link = final_state.get("post_link")
         print(f"[worker] {_now()} cycle done - status={status} post_id={post_id} link={link}", flush=True)
+        if mem is not None:
+            mem.report(final_state)
+        # --timing: the first cycle has loaded everything it needed
+        _report_timing()
+        return final_state
     except Exception as e:
         print(f"[worker] {_now()} cycle error: {e}", flush=True)
         traceback.print_exc()
         raise
 
 # ---------- main loop ----------
-def main_loop():
-    app = build_app()
+def _wait(secs: int):
+    elapsed = 0
+    while elapsed < secs and not SHUTDOWN:
+        if elapsed % HEARTBEAT_EVERY == 0:
+            remaining = secs - elapsed
+            print(f"[worker] {_now()} alive - waiting {remaining}s", flush=True)
+        time.sleep(1)
+        elapsed += 1
+
+def _fixed_step(app, mem):
+    one_cycle(app, mem)
+    _wait(SLEEP_SECS)
+
+def _adaptive_step(app, mem, sched, last_run):
+    # poll only feeds that are due; run the pipeline only on new high-ranked items
+    candidates = sched.poll_due()
+    gap_left = int(last_run + MIN_CYCLE_GAP - time.time())
+    if candidates and gap_left <= 0:
+        last_run = time.time()
+        taken = sched.take_pending()
+        try:
+            one_cycle(app, mem, {"candidates": taken})
+        except Exception:
+            sched.pending[:0] = taken  # keep them for the retry
+            raise
+        gap_left = MIN_CYCLE_GAP
+    wait = sched.seconds_until_due()
+    if candidates and gap_left > 0:
+        wait = min(wait, gap_left)
+    _wait(max(wait, 1))
+    return last_run
+
+def main_loop(dry_run: bool = False):
+    app = build_app(dry_run=dry_run)
+    mem = CycleTracker()
+    sched = None
+    if SCHEDULE == "adaptive":
+        from agents.scheduler import FeedScheduler
+        sched = FeedScheduler()
+    last_run = 0.0
     backoff = 5  # seconds
+    print(f"[worker] {_now()} schedule={SCHEDULE}", flush=True)
 
     while not SHUTDOWN:
         try:
-            one_cycle(app)
+            if sched is None:
+                _fixed_step(app, mem)
+            else:
+                last_run = _adaptive_step(app, mem, sched, last_run)
             backoff = 5  # reset backoff on success
 
-            elapsed = 0
-            while elapsed < SLEEP_SECS and not SHUTDOWN:
-                if elapsed % HEARTBEAT_EVERY == 0:
-                    remaining = SLEEP_SECS - elapsed
-                    print(f"[worker] {_now()} alive - waiting {remaining}s", flush=True)
-                time.sleep(1)
-                elapsed += 1
-
         except Exception:
             delay = min(backoff, MAX_BACKOFF)
             print(f"[worker] {_now()} retry in {delay}s...", flush=True)
@@ -117,6 +200,99 @@ def main_loop():
 
     print(f"[worker] {_now()} stopped.", flush=True)
 
-if __name__ == "__main__":
+# ---------- CLI ----------
+def _read_state(path: str) -> PipelineState:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise SystemExit(f"[cli] {path}: state must be a JSON object")
+    try:
+        return PipelineState.from_dict(data)
+    except ValueError as e:
+        raise SystemExit(f"[cli] {path}: {e}")
+
+def _write_state(state: PipelineState, path: str, stdout=None):
+    data = json.dumps(state.to_dict(), ensure_ascii=False, indent=2, default=str)
+    if path == "-":
+        # logs are redirected to stderr in this mode (see main), stdout carries only JSON
+        out = stdout or sys.stdout
+        out.write(data + "\n")
+        out.flush()
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(data)
+    print(f"[cli] state saved to {path}", flush=True)
+
+def cmd_worker(args):
     print(f"[worker] {_now()} starting...", flush=True)
-    main_loop()
+    main_loop(dry_run=args.dry_run)
+
+def cmd_once(args):
+    app = build_app(dry_run=args.dry_run)
+    final_state = one_cycle(app, CycleTracker())
+    if args.save_state:
+        _write_state(PipelineState.from_dict(final_state), args.save_state, args.stdout)
+
+def cmd_node(args):
+    state = _read_state(args.state) if args.state else PipelineState()
+    fn = dry_run_publisher if (args.dry_run and args.name == "publisher") else load_node(args.name)
+    budget.start_cycle()
+    update = profiled(args.name, fn)(state)
+    state.apply(update)
+    print(f"[cli] {args.name} -> status={state.status}", flush=True)
+    _write_state(state, args.out, args.stdout)
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Reddit -> AI -> WordPress content worker")
+    p.add_argument("--timing", action="store_true",
+                   help="print per-import startup cost (reported after the first cycle; "
+                        "imports made via importlib.import_module are not seen)")
+    sub = p.add_subparsers(dest="cmd")
+
+    w = sub.add_parser("worker", help="long-running worker loop (default)")
+    w.add_argument("--dry-run", action="store_true", help="run everything except publishing")
+    w.set_defaults(func=cmd_worker)
+
+    o = sub.add_parser("once", help="run a single pipeline cycle and exit")
+    o.add_argument("--dry-run", action="store_true", help="skip publishing to WordPress")
+    o.add_argument("--save-state", metavar="PATH", help="write final state JSON ('-' for stdout)")
+    o.set_defaults(func=cmd_once)
+
+    n = sub.add_parser("node", help="run one node on a saved state JSON")
+    n.add_argument("name", choices=list(NODES))
+    n.add_argument("--state", metavar="PATH", help="input state JSON (default: empty state)")
+    n.add_argument("--out", metavar="PATH", default="-", help="output state JSON (default: stdout)")
+    n.add_argument("--dry-run", action="store_true", help="publisher: print instead of publishing")
+    n.set_defaults(func=cmd_node)
+
+    args = p.parse_args(argv)
+    if args.cmd is None:
+        args.func, args.dry_run = cmd_worker, False
+    return args
+
+def _report_timing():
+    global _TIMER
+    if _TIMER is not None:
+        _TIMER.report()
+        _TIMER = None
+
+def main(argv=None):
+    global _TIMER
+    args = parse_args(argv)
+    if args.timing and _TIMER is None:
+        # called as a function (not via `python main.py`): time from here on
+        from agents.importprof import ImportTimer
+        _TIMER = ImportTimer().install()
+
+    # state JSON on stdout: send every log line (nodes, budget, timing) to stderr
+    args.stdout = sys.stdout
+    json_to_stdout = getattr(args, "out", None) == "-" or getattr(args, "save_state", None) == "-"
+    redirect = contextlib.redirect_stdout(sys.stderr) if json_to_stdout else contextlib.nullcontext()
+    with redirect:
+        try:
+            args.func(args)
+        finally:
+            _report_timing()
+
+if __name__ == "__main__":
+    sys.exit(main())